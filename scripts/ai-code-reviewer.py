@@ -45,27 +45,44 @@ Features:
 
 import os
 import re
+import gzip
 import json
 import time
-import requests
-from openai import OpenAI
-from typing import List, Dict, Any, Optional, Set
+import random
+import hashlib
+import asyncio
+import functools
+import httpx
+from openai import AsyncOpenAI, RateLimitError
+from typing import List, Dict, Any, Iterator, Optional, Set
 
 # Environment variables
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 MODEL_INLINE = os.getenv('OPENAI_MODEL', 'gpt-4o')  # For inline reviews
-MODEL_SUMMARY = 'gpt-4o-mini'  # For architectural summary (more cost-effective)
+MODEL_INLINE_LIGHT = os.getenv('OPENAI_LIGHT_MODEL', 'gpt-4o-mini')  # For inline reviews of simpler file categories
+MODEL_SUMMARY = os.getenv('OPENAI_SUMMARY_MODEL', 'gpt-4o-mini')  # For architectural summary (more cost-effective)
 PR_NUMBER = os.getenv('PR_NUMBER')
 REPO = os.getenv('GITHUB_REPOSITORY')
 COMMIT_SHA = os.getenv('PR_HEAD_SHA')
+CACHE_DIR = os.path.expanduser(os.getenv('REVIEW_CACHE_DIR', '~/.cache/ai-code-reviewer'))
+
+# Inline review model per file category: UI code gets the stronger model,
+# config, test and plain Swift files use the cheaper, faster one
+MODEL_FOR_CATEGORY = {
+    'SwiftUI': MODEL_INLINE,
+    'UI': MODEL_INLINE,
+    'Swift': MODEL_INLINE_LIGHT,
+    'Test': MODEL_INLINE_LIGHT,
+    'Config': MODEL_INLINE_LIGHT,
+}
 
 if not all([GITHUB_TOKEN, OPENAI_API_KEY, PR_NUMBER, REPO, COMMIT_SHA]):
     print("❌ Missing required environment variables")
     exit(1)
 
 # Initialize OpenAI client
-client = OpenAI(api_key=OPENAI_API_KEY)
+aclient = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
 # GitHub API headers
 HEADERS = {
@@ -73,8 +90,23 @@ HEADERS = {
     "Accept": "application/vnd.github+json"
 }
 
+# Shared GitHub HTTP client: keep-alive connection pool with HTTP/2 multiplexing
+HTTP = httpx.AsyncClient(
+    http2=True,
+    headers=HEADERS,
+    timeout=30,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+)
+
 OWNER, REPO_NAME = REPO.split('/')
 
+# Fixed for the whole run, so built once instead of on every post and retry
+SHORT_SHA = os.getenv('GITHUB_SHA', 'Unknown commit')[:7]
+PULL_URL = f"https://api.github.com/repos/{OWNER}/{REPO_NAME}/pulls/{PR_NUMBER}"
+FILES_URL = f"{PULL_URL}/files"
+REVIEWS_URL = f"{PULL_URL}/reviews"
+COMMENTS_URL = f"https://api.github.com/repos/{OWNER}/{REPO_NAME}/issues/{PR_NUMBER}/comments"
+
 # File patterns to exclude from review - Enhanced for iOS/Swift projects
 EXCLUDE_PATTERNS = [
     # Xcode project files
@@ -117,25 +149,436 @@ EXCLUDE_PATTERNS = [
     '.ipa', '.app', '.dSYM'
 ]
 
+# Extension patterns are matched against the suffix of every path component (so
+# bundle directories like Foo.xcodeproj/ are caught); other patterns are path fragments
+EXCLUDE_EXTS = frozenset(p for p in EXCLUDE_PATTERNS if p.startswith('.') and '/' not in p)
+EXCLUDE_FRAG_RE = re.compile('|'.join(
+    re.escape(p) for p in EXCLUDE_PATTERNS if p not in EXCLUDE_EXTS
+))
+
+# SwiftUI / UIKit content indicators used for categorization
+SWIFTUI_INDICATORS: frozenset[str] = frozenset({
+    'import SwiftUI', 'SwiftUI.', 'View', '@State', '@Binding',
+    '@ObservableObject', '@Observable', '@StateObject', '@EnvironmentObject',
+    'NavigationView', 'NavigationStack', 'VStack', 'HStack', 'ZStack',
+    'Button', 'Text', 'Image', 'ScrollView', 'List', 'Form',
+    'NavigationSplitView', 'Grid', 'LazyVStack', 'LazyHStack'
+})
+UIKIT_INDICATORS: frozenset[str] = frozenset({
+    'import UIKit', 'UIView', 'UIViewController', 'UITableView',
+    'UICollectionView', 'UIButton', 'UILabel', 'UIImageView',
+    'viewDidLoad', 'viewWillAppear', 'IBOutlet', 'IBAction',
+    'UINavigationController', 'UITabBarController', 'UIStoryboard'
+})
+
+# Path fragments marking files that are part of the iOS project structure
+IOS_PROJECT_INDICATORS = (
+    'Package.swift',           # Swift Package Manager
+    'project.pbxproj',         # Xcode project file
+    'Info.plist',             # iOS app configuration
+    'AppDelegate.swift',       # iOS app delegate
+    'SceneDelegate.swift',     # iOS scene delegate
+    'ContentView.swift',       # SwiftUI main view
+    'LaunchScreen.storyboard', # Launch screen
+    '.entitlements',          # App entitlements
+    'Podfile',                # CocoaPods
+    'Cartfile',               # Carthage
+    'fastlane',               # Deployment automation
+    '.xcconfig',              # Xcode configuration
+    'GoogleService-Info.plist', # Firebase
+    'Localizable.strings'      # Localization
+)
+
+# Path fragments marking configuration files
+CONFIG_FILE_INDICATORS = (
+    '.plist', '.xcconfig', '.json', '.yaml', '.yml',
+    'Package.swift', 'Podfile', 'Cartfile', '.entitlements'
+)
+
+# App entry point files, categorized by whether they use @main
+MAIN_APP_FILES: frozenset[str] = frozenset({'AppDelegate.swift', 'SceneDelegate.swift', 'App.swift'})
+
+# Content indicators used for file context and categorization, grouped by signal
+CONTENT_INDICATORS = {
+    'uses_async_await': ('async ', 'await '),
+    'uses_combine': ('import Combine', 'Publisher'),
+    'uses_core_data': ('import CoreData', 'NSManagedObject'),
+    'uses_swift_data': ('import SwiftData', '@Model'),
+    'uses_networking': ('URLSession', 'Alamofire', 'NetworkReachability'),
+    'has_ui_tests': ('XCUIApplication', 'XCUIElement'),
+    'has_unit_tests': ('XCTestCase', '@testable'),
+    'uses_accessibility': ('accessibilityLabel', 'accessibilityHint', 'VoiceOver'),
+    'uses_localization': ('NSLocalizedString', 'String(localized:'),
+    'test_keywords': ('XCTest', '@testable', 'XCTAssert', 'XCUIApplication'),
+    'swiftui': SWIFTUI_INDICATORS,
+    'uikit': UIKIT_INDICATORS,
+    'main_entry': ('@main',),
+}
+
+# One bit per indicator group
+INDICATOR_BITS = {name: 1 << i for i, name in enumerate(CONTENT_INDICATORS)}
+
+def _build_indicator_table() -> Dict[str, int]:
+    """Map each indicator to the bits of every group it satisfies.
+
+    A match also sets the bits of any shorter indicator it contains (e.g.
+    'UIViewController' implies 'View'), so the single regex scan reports the
+    same groups as individual substring checks would.
+    """
+    all_indicators = {ind for group in CONTENT_INDICATORS.values() for ind in group}
+    table = {}
+    for indicator in all_indicators:
+        flags = 0
+        for name, group in CONTENT_INDICATORS.items():
+            if any(candidate in indicator for candidate in group):
+                flags |= INDICATOR_BITS[name]
+        table[indicator] = flags
+    return table
+
+INDICATOR_TABLE = _build_indicator_table()
+
+# Unified diff hunk header, capturing the starting line number in the new file
+HUNK_RE = re.compile(r'@@ .* \+(\d+)(?:,\d+)? @@')
+
+# ')(' or ') (' - chained calls, used as a complexity signal
+METHOD_CHAIN_RE = re.compile(r'\) ?\(')
+
+# Line ranges of every hunk header in a patch, stripped from cache keys
+HUNK_RANGE_RE = re.compile(r'^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@', re.MULTILINE)
+
+# Added lines not worth an inline review: comments, imports, closing braces, blanks
+TRIVIAL_RE = re.compile(r'^\s*(//|import\s|}|$)')
+
+# Longest alternatives first so each match captures the most specific indicator
+INDICATOR_RE = re.compile('|'.join(
+    map(re.escape, sorted(INDICATOR_TABLE, key=len, reverse=True))
+))
+
 # Rate limiting configuration
-API_DELAY = 2.0  # Seconds between API calls to avoid rate limits
 MAX_COMMENTS_PER_FILE = 5  # Limit comments per file to avoid spam
+MAX_CONTEXT_LINES = 300  # Limit diff context per file to avoid huge prompts
+MAX_DIFF_CHARS = 4000  # Character budget for the diff context sent per file
+MIN_MEANINGFUL_LINES = 2  # Skip the inline review when fewer non-trivial lines were added
+MAX_REVIEW_ADDITIONS = 2000  # Files with more additions are only covered by the summary
+REVIEW_CONCURRENCY = int(os.getenv('REVIEW_CONCURRENCY', '8'))  # Max in-flight OpenAI calls
+# Max files reviewed at once; higher than REVIEW_CONCURRENCY so cache hits and
+# coalesced duplicates don't wait behind files holding an OpenAI slot
+MAX_CONCURRENT_FILES = int(os.getenv('MAX_CONCURRENT_FILES', str(REVIEW_CONCURRENCY * 2)))
+# Max in-flight review posts. GitHub asks for content-creating requests to be
+# sent serially (concurrent ones trip secondary rate limits), so keep this at 1
+# and let github_request's retry/backoff absorb any limits that still hit
+GITHUB_CONCURRENCY = int(os.getenv('GITHUB_CONCURRENCY', '1'))
+
+GITHUB_MIN_REMAINING = 5  # Only throttle GitHub calls when the quota drops below this
+GITHUB_MAX_RETRIES = 4  # Retries for rate-limited or failing GitHub requests (backoff 1s, 2s, 4s, 8s)
+GITHUB_RETRY_STATUSES = frozenset({500, 502, 503, 504})  # Transient GitHub errors worth retrying
+# OpenAI limits apply per model; the defaults are usage tier 1 (gpt-4o and
+# gpt-4o-mini), so set these to the key's actual limits on higher tiers
+OPENAI_RPM = int(os.getenv('OPENAI_RPM', '500'))  # Requests-per-minute limit for MODEL_INLINE
+OPENAI_TPM = int(os.getenv('OPENAI_TPM', '30000'))  # Tokens-per-minute limit for MODEL_INLINE
+OPENAI_LIGHT_RPM = int(os.getenv('OPENAI_LIGHT_RPM', '500'))  # Requests-per-minute limit for MODEL_INLINE_LIGHT
+OPENAI_LIGHT_TPM = int(os.getenv('OPENAI_LIGHT_TPM', '200000'))  # Tokens-per-minute limit for MODEL_INLINE_LIGHT
+# (rpm, tpm) per model; other models (e.g. a custom MODEL_SUMMARY) use the MODEL_INLINE limits
+OPENAI_MODEL_LIMITS = {
+    MODEL_INLINE_LIGHT: (OPENAI_LIGHT_RPM, OPENAI_LIGHT_TPM),
+    MODEL_INLINE: (OPENAI_RPM, OPENAI_TPM),
+}
+REVIEW_BATCH_SIZE = int(os.getenv('REVIEW_BATCH_SIZE', '5'))  # Max files reviewed per OpenAI request
+REVIEW_BATCH_WAIT = 0.05  # Seconds to wait for more files of the same category before sending a batch
+SUMMARY_CHUNK_THRESHOLD = 50  # Larger PRs are summarized in groups first, then merged
+SUMMARY_CHUNK_SIZE = 25  # Files per group in a hierarchical summary
+SMALL_PR_MAX_FILES = 2  # PRs this small get no model summary when the inline review finds nothing
+
+# Bounds concurrent OpenAI requests across all per-file review tasks
+SEM = asyncio.Semaphore(REVIEW_CONCURRENCY)
+
+class GHLimiter:
+    """Adaptive GitHub rate limiter driven by the X-RateLimit-* response headers.
+
+    Requests pass straight through while quota is available; only when the
+    remaining quota is nearly exhausted do callers wait for the reset window.
+    """
+
+    def __init__(self, min_remaining: int = GITHUB_MIN_REMAINING):
+        self.min_remaining = min_remaining
+        self.remaining: Optional[int] = None  # Unknown until the first response
+        self.reset_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for the rate limit window to reset if quota is nearly exhausted."""
+        async with self.lock:
+            if self.remaining is not None and self.remaining < self.min_remaining:
+                delay = max(0.0, self.reset_at - time.time())
+                if delay:
+                    print(f"🚫 GitHub quota low ({self.remaining} left) - waiting {delay:.0f}s for reset...")
+                    await asyncio.sleep(delay)
+                self.remaining = None
+
+    def update(self, response: httpx.Response) -> None:
+        """Record the latest quota information from a GitHub response."""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = float(reset)
+
+GH_LIMITER = GHLimiter()
+
+def github_retry_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying a GitHub response, or None if it shouldn't be retried."""
+    if response.status_code in GITHUB_RETRY_STATUSES:
+        return random.uniform(0, 2 ** attempt)  # Transient server error: full-jitter backoff
+    if response.status_code not in (403, 429):
+        return None
+
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is not None:
+        return float(retry_after)
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        return max(0.0, GH_LIMITER.reset_at - time.time())
+    if response.status_code == 429 or 'rate limit' in response.text.lower():
+        return float(2 ** attempt)  # Secondary rate limit without guidance: back off exponentially
+
+    return None  # Permission error, not rate limiting
+
+async def github_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a GitHub API request through the shared client and rate limiter.
+
+    Rate-limited responses (403/429) and transient server errors (5xx) are
+    retried up to GITHUB_MAX_RETRIES times, honoring Retry-After and
+    X-RateLimit-Reset and otherwise backing off exponentially. Permission 403s
+    are returned immediately.
+    """
+    for attempt in range(GITHUB_MAX_RETRIES + 1):
+        await GH_LIMITER.acquire()
+        response = await HTTP.request(method, url, **kwargs)
+        GH_LIMITER.update(response)
+
+        delay = github_retry_delay(response, attempt)
+        if delay is None or attempt == GITHUB_MAX_RETRIES:
+            return response
+
+        print(f"🚫 GitHub returned {response.status_code} - retry {attempt + 1}/{GITHUB_MAX_RETRIES} in {delay:.0f}s...")
+        await asyncio.sleep(delay)
+
+    return response
+
+class RateLimiter:
+    """Client-side token bucket for OpenAI requests-per-minute and tokens-per-minute.
+
+    Both capacities refill continuously. Callers wait until the buckets cover
+    a request's estimated cost, so bursts are smoothed out before they turn
+    into 429s instead of sleeping a fixed worst-case delay.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.max_requests = float(requests_per_minute)
+        self.max_tokens = float(tokens_per_minute)
+        self.available_request_capacity = self.max_requests
+        self.available_token_capacity = self.max_tokens
+        self.last_update = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.available_request_capacity = min(
+            self.max_requests, self.available_request_capacity + elapsed * self.max_requests / 60
+        )
+        self.available_token_capacity = min(
+            self.max_tokens, self.available_token_capacity + elapsed * self.max_tokens / 60
+        )
+
+    async def acquire(self, tokens: int, requests: int = 1) -> None:
+        """Wait until there is capacity for the request, then consume it."""
+        tokens = min(tokens, self.max_tokens)  # An oversized request must still be able to run
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self._refill()
+                if (self.available_request_capacity >= requests and
+                        self.available_token_capacity >= tokens):
+                    self.available_request_capacity -= requests
+                    self.available_token_capacity -= tokens
+                    return
+
+                await asyncio.sleep(max(
+                    (requests - self.available_request_capacity) * 60 / self.max_requests,
+                    (tokens - self.available_token_capacity) * 60 / self.max_tokens
+                ))
+
+    def release(self, tokens: int) -> None:
+        """Return reserved tokens a request did not use."""
+        self._refill()
+        self.available_token_capacity = min(self.max_tokens, self.available_token_capacity + tokens)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all new requests for the given number of seconds (e.g. after a 429)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+# One bucket per model, since OpenAI enforces RPM/TPM separately for each model
+OPENAI_LIMITERS: Dict[str, RateLimiter] = {}
+
+def openai_limiter(model: str) -> RateLimiter:
+    """Get the rate limiter for a model, creating it on first use."""
+    if model not in OPENAI_LIMITERS:
+        OPENAI_LIMITERS[model] = RateLimiter(*OPENAI_MODEL_LIMITS.get(model, (OPENAI_RPM, OPENAI_TPM)))
+    return OPENAI_LIMITERS[model]
+
+# OpenAI reset durations look like "20ms", "1s" or "6m0s"
+DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+def parse_reset_duration(value: Optional[str]) -> float:
+    """Convert an x-ratelimit-reset-* header value to seconds."""
+    if not value:
+        return 0.0
+    return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in DURATION_RE.findall(value))
+
+async def create_chat_completion(**kwargs) -> Any:
+    """Call the chat completions API through the model's OpenAI rate limiter."""
+    limiter = openai_limiter(kwargs['model'])
+
+    # Rough estimate: ~4 characters per prompt token, plus the full completion budget
+    prompt_chars = sum(len(message['content']) for message in kwargs['messages'])
+    estimated_tokens = prompt_chars // 4 + kwargs.get('max_tokens', 0)
+    await limiter.acquire(estimated_tokens)
+
+    try:
+        response = await aclient.chat.completions.create(**kwargs)
+    except RateLimitError as e:
+        # Hold every queued request for this model until OpenAI's window resets
+        headers = e.response.headers
+        delay = max(parse_reset_duration(headers.get('x-ratelimit-reset-requests')),
+                    parse_reset_duration(headers.get('x-ratelimit-reset-tokens')))
+        print(f"🚫 OpenAI rate limit hit for {kwargs['model']} - pausing new requests for {delay:.1f}s")
+        limiter.pause(delay)
+        raise
+
+    # Completions rarely use all of max_tokens; hand the unused reservation back
+    # (streamed responses report no usage, so they keep the estimate)
+    usage = getattr(response, 'usage', None)
+    if usage is not None:
+        limiter.release(max(0, estimated_tokens - usage.total_tokens))
+
+    return response
+
+# On-disk caches (gzipped JSON) that let CI re-runs skip repeated work
+SUGGESTIONS_CACHE_PATH = os.path.join(CACHE_DIR, 'suggestions.json.gz')
+PR_FILES_CACHE_PATH = os.path.join(CACHE_DIR, f'pr-files-{PR_NUMBER}-{COMMIT_SHA}.json.gz')
+SUMMARY_CACHE_DIR = os.path.join(CACHE_DIR, 'summaries')
+
+def load_json_cache(path: str) -> Any:
+    """Load a gzipped JSON cache file. Returns None if missing or unreadable."""
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
 
-def rate_limited_request(func):
-    """Decorator to add rate limiting to API requests."""
-    def wrapper(*args, **kwargs):
-        time.sleep(API_DELAY)  # Wait before making request
-        return func(*args, **kwargs)
-    return wrapper
-
-def fetch_pr_files() -> List[Dict[str, Any]]:
-    """Fetch the list of files changed in the pull request."""
-    url = f"https://api.github.com/repos/{OWNER}/{REPO_NAME}/pulls/{PR_NUMBER}/files"
-    response = requests.get(url, headers=HEADERS)
-    if response.status_code != 200:
-        print(f"❌ Error fetching PR files: {response.text}")
-        return []
-    return response.json()
+def save_json_cache(path: str, data: Any) -> None:
+    """Atomically write a gzipped JSON cache file, ignoring filesystem errors."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Could not write cache {path}: {e}")
+
+def summary_cache_path(files: List[Dict[str, Any]]) -> str:
+    """Cache path for an architectural summary, keyed by the file list, model and schema."""
+    file_stats = sorted((f['filename'], f.get('additions', 0), f.get('deletions', 0)) for f in files)
+    key = hashlib.sha256(json.dumps([file_stats, MODEL_SUMMARY, SUMMARY_SCHEMA]).encode('utf-8')).hexdigest()
+    return os.path.join(SUMMARY_CACHE_DIR, f'{key}.md')
+
+def load_text_cache(path: str) -> Optional[str]:
+    """Load a cached text file. Returns None if missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def save_text_cache(path: str, text: str) -> None:
+    """Atomically write a cached text file, ignoring filesystem errors."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️  Could not write cache {path}: {e}")
+
+# Review comments from previous runs, keyed by suggestion_cache_key(). Comments
+# are stored by position among the added lines rather than by file line number,
+# so they can be reused after the hunks shift (rebases, reapplied changes).
+SUGGESTIONS_CACHE: Dict[str, List[Dict[str, Any]]] = load_json_cache(SUGGESTIONS_CACHE_PATH) or {}
+# Entries produced or reused by this run whose comments were posted (or that
+# had none); only these are persisted
+SUGGESTIONS_USED: Dict[str, List[Dict[str, Any]]] = {}
+# Entries waiting for their review to be posted, keyed by filename
+SUGGESTIONS_PENDING: Dict[str, tuple[str, List[Dict[str, Any]]]] = {}
+
+def suggestion_cache_key(filename: str, patch: str, category: str) -> str:
+    """Cache key for a file's review comments.
+
+    Covers the filename and patch plus everything that shapes the review: the
+    category's model and system prompt, the review instructions and the
+    schema. Hunk line numbers are stripped, so the same changes at a
+    different offset in the file map to the same key.
+    """
+    normalized_patch = HUNK_RANGE_RE.sub('@@ @@', patch)
+    key_parts = [filename, normalized_patch, category, MODEL_FOR_CATEGORY[category],
+                 get_system_message(category), INLINE_REVIEW_INSTRUCTIONS, json.dumps(REVIEW_SCHEMA)]
+    return hashlib.sha256("\0".join(key_parts).encode('utf-8')).hexdigest()
+
+def remember_review(filename: str, cache_key: str, entries: List[Dict[str, Any]]) -> None:
+    """Record a file's review for the cache; entries with comments wait until posted."""
+    if entries:
+        SUGGESTIONS_PENDING[filename] = (cache_key, entries)
+    else:
+        SUGGESTIONS_USED[cache_key] = entries
+
+def confirm_posted_review(comments: List[Dict[str, Any]]) -> None:
+    """Mark the reviews behind successfully posted comments as cacheable."""
+    for path in {comment['path'] for comment in comments}:
+        pending = SUGGESTIONS_PENDING.pop(path, None)
+        if pending is not None:
+            cache_key, entries = pending
+            SUGGESTIONS_USED[cache_key] = entries
+
+async def fetch_pr_files() -> List[Dict[str, Any]]:
+    """Fetch the full list of files changed in the pull request."""
+    cached = load_json_cache(PR_FILES_CACHE_PATH)
+    if cached is not None:
+        print(f"♻️  Using cached file list for PR #{PR_NUMBER} at {COMMIT_SHA[:7]}")
+        return cached
+
+    # GitHub pages this list (30 files by default); follow the Link header to get all of it
+    files = []
+    url = f"{FILES_URL}?per_page=100"
+    while url:
+        response = await github_request('GET', url)
+        if response.status_code != 200:
+            print(f"❌ Error fetching PR files: {response.text}")
+            return []
+
+        files.extend(response.json())
+        url = response.links.get('next', {}).get('url')
+
+    save_json_cache(PR_FILES_CACHE_PATH, files)
+    return files
 
 def should_review_file(file_data: Dict[str, Any]) -> bool:
     """Determine if a file should be reviewed based on exclude patterns and status."""
@@ -147,7 +590,8 @@ def should_review_file(file_data: Dict[str, Any]) -> bool:
         return False
 
     # Skip files matching exclude patterns
-    if any(pattern in filename for pattern in EXCLUDE_PATTERNS):
+    if (any(os.path.splitext(part)[1] in EXCLUDE_EXTS for part in filename.split('/')) or
+        EXCLUDE_FRAG_RE.search(filename)):
         print(f"⏭️  Skipping {filename} (matches exclude pattern)")
         return False
 
@@ -158,54 +602,70 @@ def should_review_file(file_data: Dict[str, Any]) -> bool:
 
     return True
 
+def iter_lines(text: str) -> Iterator[str]:
+    """Lazily yield the lines of text, split on line feeds only (same lines as split).
+
+    Unlike split() this doesn't build the whole list up front, so callers that
+    stop early only pay for the lines they consume. Unlike splitlines() it
+    ignores form feeds and Unicode separators, keeping diff line numbers exact.
+    """
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
 def is_ios_project_file(filename: str) -> bool:
     """Check if file is part of iOS project structure for enhanced categorization."""
-    ios_project_indicators = [
-        'Package.swift',           # Swift Package Manager
-        'project.pbxproj',         # Xcode project file
-        'Info.plist',             # iOS app configuration
-        'AppDelegate.swift',       # iOS app delegate
-        'SceneDelegate.swift',     # iOS scene delegate
-        'ContentView.swift',       # SwiftUI main view
-        'LaunchScreen.storyboard', # Launch screen
-        '.entitlements',          # App entitlements
-        'Podfile',                # CocoaPods
-        'Cartfile',               # Carthage
-        'fastlane',               # Deployment automation
-        '.xcconfig',              # Xcode configuration
-        'GoogleService-Info.plist', # Firebase
-        'Localizable.strings'      # Localization
-    ]
-
-    return any(indicator in filename for indicator in ios_project_indicators)
+    return any(indicator in filename for indicator in IOS_PROJECT_INDICATORS)
+
+def scan_indicators(content: str) -> int:
+    """Scan content once and return the bitfield of indicator groups present."""
+    flags = 0
+    for match in INDICATOR_RE.finditer(content):
+        flags |= INDICATOR_TABLE[match.group()]
+    return flags
+
+def scan_complexity(content: str) -> Dict[str, bool]:
+    """Compute complexity indicators, counting and splitting in C rather than per character."""
+    return {
+        'nested_closures': content.count('{ ') > 3,
+        # Length check first: it is cheap and rules out most lines before strip()
+        'long_functions': any(len(line) > 80 and line.strip().startswith('func ') for line in content.split('\n')),
+        'many_parameters': METHOD_CHAIN_RE.search(content) is not None,  # Method chaining detection
+    }
 
 def get_file_context_info(filename: str, content: str) -> Dict[str, Any]:
     """Extract additional context information from iOS files for better review."""
+    flags = scan_indicators(content)
     context = {
         'is_ios_project': is_ios_project_file(filename),
-        'uses_async_await': 'async ' in content or 'await ' in content,
-        'uses_combine': 'import Combine' in content or 'Publisher' in content,
-        'uses_core_data': 'import CoreData' in content or 'NSManagedObject' in content,
-        'uses_swift_data': 'import SwiftData' in content or '@Model' in content,
-        'uses_networking': any(keyword in content for keyword in ['URLSession', 'Alamofire', 'NetworkReachability']),
-        'has_ui_tests': 'XCUIApplication' in content or 'XCUIElement' in content,
-        'has_unit_tests': 'XCTestCase' in content or '@testable' in content,
-        'uses_accessibility': any(keyword in content for keyword in ['accessibilityLabel', 'accessibilityHint', 'VoiceOver']),
-        'uses_localization': 'NSLocalizedString' in content or 'String(localized:' in content,
-        'file_size_lines': len(content.split('\n')),
-        'complexity_indicators': {
-            'nested_closures': content.count('{ ') > 3,
-            'long_functions': any(line.strip().startswith('func ') and len(line) > 80 for line in content.split('\n')),
-            'many_parameters': ')(' in content.replace(') (', ')('),  # Method chaining detection
-        }
+        'uses_async_await': bool(flags & INDICATOR_BITS['uses_async_await']),
+        'uses_combine': bool(flags & INDICATOR_BITS['uses_combine']),
+        'uses_core_data': bool(flags & INDICATOR_BITS['uses_core_data']),
+        'uses_swift_data': bool(flags & INDICATOR_BITS['uses_swift_data']),
+        'uses_networking': bool(flags & INDICATOR_BITS['uses_networking']),
+        'has_ui_tests': bool(flags & INDICATOR_BITS['has_ui_tests']),
+        'has_unit_tests': bool(flags & INDICATOR_BITS['has_unit_tests']),
+        'uses_accessibility': bool(flags & INDICATOR_BITS['uses_accessibility']),
+        'uses_localization': bool(flags & INDICATOR_BITS['uses_localization']),
+        'indicator_flags': flags,
+        'file_size_lines': content.count('\n') + 1,
+        'complexity_indicators': scan_complexity(content)
     }
 
     return context
 
-def categorize_file(filename: str, content: str) -> str:
-    """Categorize file type for targeted review prompts with enhanced detection."""
-    # Get additional context
-    context = get_file_context_info(filename, content)
+def categorize_file_from_ctx(filename: str, context: Dict[str, Any]) -> str:
+    """Categorize file type for targeted review prompts with enhanced detection.
+
+    Uses the indicator bitfield from get_file_context_info, so the content is
+    not scanned again.
+    """
+    flags = context['indicator_flags']
 
     # Enhanced test detection
     if (re.search(r'Test\.swift$', filename) or
@@ -215,62 +675,48 @@ def categorize_file(filename: str, content: str) -> str:
         'Stub' in filename or
         context['has_ui_tests'] or
         context['has_unit_tests'] or
-        any(keyword in content for keyword in ['XCTest', '@testable', 'XCTAssert', 'XCUIApplication'])):
+        flags & INDICATOR_BITS['test_keywords']):
         return 'Test'
 
     # Enhanced SwiftUI detection
     if filename.endswith('.swift'):
-        swiftui_indicators = [
-            'import SwiftUI', 'SwiftUI.', 'View', '@State', '@Binding',
-            '@ObservableObject', '@Observable', '@StateObject', '@EnvironmentObject',
-            'NavigationView', 'NavigationStack', 'VStack', 'HStack', 'ZStack',
-            'Button', 'Text', 'Image', 'ScrollView', 'List', 'Form',
-            'NavigationSplitView', 'Grid', 'LazyVStack', 'LazyHStack'
-        ]
-        if any(indicator in content for indicator in swiftui_indicators):
+        if flags & INDICATOR_BITS['swiftui']:
             return 'SwiftUI'
 
         # Enhanced UIKit detection
-        uikit_indicators = [
-            'import UIKit', 'UIView', 'UIViewController', 'UITableView',
-            'UICollectionView', 'UIButton', 'UILabel', 'UIImageView',
-            'viewDidLoad', 'viewWillAppear', 'IBOutlet', 'IBAction',
-            'UINavigationController', 'UITabBarController', 'UIStoryboard'
-        ]
-        if any(indicator in content for indicator in uikit_indicators):
+        if flags & INDICATOR_BITS['uikit']:
             return 'UI'
 
         # Special case for main app files
-        if filename in ['AppDelegate.swift', 'SceneDelegate.swift', 'App.swift']:
-            return 'SwiftUI' if '@main' in content else 'UI'
+        if filename in MAIN_APP_FILES:
+            return 'SwiftUI' if flags & INDICATOR_BITS['main_entry'] else 'UI'
 
         # General Swift file
         return 'Swift'
 
     # Enhanced configuration file detection
-    config_files = [
-        '.plist', '.xcconfig', '.json', '.yaml', '.yml',
-        'Package.swift', 'Podfile', 'Cartfile', '.entitlements'
-    ]
-    if any(filename.endswith(ext) or ext in filename for ext in config_files):
+    if any(indicator in filename for indicator in CONFIG_FILE_INDICATORS):
         return 'Config'
 
     return 'Swift'
 
 def parse_diff_for_review(patch: str) -> tuple[List[Dict[str, Any]], Set[int]]:
     """Parse diff patch to extract context and valid line numbers for comments."""
-    lines = patch.split('\n')
     context_lines = []
     valid_comment_lines = set()  # Track which lines can receive comments
     new_line_number = 0
 
-    for line in lines:
-        if line.startswith('@@'):
+    for line in iter_lines(patch):
+        if len(context_lines) >= MAX_CONTEXT_LINES:
+            break  # Limit context to avoid huge prompts
+
+        marker = line[:1]
+        if marker == '@':
             # Extract starting line number for new file
-            match = re.search(r'@@ .* \+(\d+)(,\d+)? @@', line)
+            match = HUNK_RE.match(line)
             if match:
                 new_line_number = int(match.group(1)) - 1
-        elif line.startswith('+'):
+        elif marker == '+':
             # New added line - these can receive comments
             new_line_number += 1
             content = line[1:]  # Remove '+' prefix
@@ -280,7 +726,7 @@ def parse_diff_for_review(patch: str) -> tuple[List[Dict[str, Any]], Set[int]]:
                 'type': 'added'
             })
             valid_comment_lines.add(new_line_number)  # Mark as valid for comments
-        elif line.startswith(' '):
+        elif marker == ' ':
             # Context line (unchanged)
             new_line_number += 1
             context_lines.append({
@@ -290,10 +736,58 @@ def parse_diff_for_review(patch: str) -> tuple[List[Dict[str, Any]], Set[int]]:
             })
         # Skip removed lines (don't increment line number)
 
-    return context_lines[:300], valid_comment_lines  # Limit context to avoid huge prompts
-
+    return context_lines, valid_comment_lines
+
+def format_diff_line(line: Dict[str, Any]) -> str:
+    """Render a parsed diff line for the prompt."""
+    # Only added lines can receive comments, so only they carry a line number
+    if line['type'] == 'added':
+        return f"Line {line['line_number']}: {line['content']}"
+    return f"  {line['content']}"
+
+def window_diff_context(context_lines: List[Dict[str, Any]],
+                        max_chars: int = MAX_DIFF_CHARS) -> List[Dict[str, Any]]:
+    """Trim diff context to a character budget, centred on the largest run of added lines."""
+    sizes = [len(format_diff_line(line)) + 1 for line in context_lines]
+    if sum(sizes) <= max_chars:
+        return context_lines
+
+    # Find the largest contiguous run of added lines
+    best_start = best_end = run_start = 0
+    for i, line in enumerate(context_lines):
+        if line['type'] != 'added':
+            run_start = i + 1
+        elif i + 1 - run_start > best_end - best_start:
+            best_start, best_end = run_start, i + 1
+
+    # Take as much of that run as fits, then grow the window on both sides
+    start = end = best_start
+    used = 0
+    while end < best_end and used + sizes[end] <= max_chars:
+        used += sizes[end]
+        end += 1
+
+    growing = end == best_end
+    while growing:
+        growing = False
+        if start > 0 and used + sizes[start - 1] <= max_chars:
+            start -= 1
+            used += sizes[start]
+            growing = True
+        if end < len(sizes) and used + sizes[end] <= max_chars:
+            used += sizes[end]
+            end += 1
+            growing = True
+
+    return context_lines[start:max(end, start + 1)]
+
+@functools.lru_cache(maxsize=8)
 def get_system_message(category: str) -> str:
-    """Get specialized system message based on file category with comprehensive Swift/iOS guidelines."""
+    """Get specialized system message based on file category with comprehensive Swift/iOS guidelines.
+
+    Cached per category so every request for a category sends a byte-identical
+    system prompt, which lets OpenAI's prompt caching reuse the prefix.
+    """
 
     base_instructions = """You are a senior iOS developer expert with 10+ years of Swift, SwiftUI, and iOS development experience.
 Follow Apple's Human Interface Guidelines and Swift best practices. Focus on code quality, performance, security, and maintainability.
@@ -550,29 +1044,243 @@ Follow Apple's Human Interface Guidelines and Swift best practices. Focus on cod
 - Use proper authentication mechanisms (OAuth, JWT)
 - Validate SSL certificates and implement certificate pinning"""
 
-async def review_file_inline(file_data: Dict[str, Any]) -> None:
-    """Perform inline code review for a single file."""
-    filename = file_data['filename']
-    patch = file_data['patch']
+# Static review instructions, sent ahead of the per-file content so the prompt
+# prefix stays identical across files
+INLINE_REVIEW_INSTRUCTIONS = f"""REVIEW FOCUS AREAS:
+1. **Code Quality**: Swift best practices, naming conventions, type safety
+2. **Architecture**: MVVM patterns, dependency injection, separation of concerns
+3. **Performance**: Memory management, lazy loading, async operations
+4. **Security**: Data validation, secure storage, privacy compliance
+5. **Accessibility**: VoiceOver support, Dynamic Type, inclusive design
+6. **Modern Swift**: Latest language features, async/await, @Observable
+7. **iOS Guidelines**: Human Interface Guidelines, App Store compliance
 
-    print(f"🔍 Reviewing {filename} for inline comments...")
+PROVIDE SPECIFIC FEEDBACK ON:
+- State management patterns (@State, @Binding, @Observable)
+- Memory leaks and retain cycles (weak/unowned references)
+- Error handling and edge cases
+- Thread safety and @MainActor usage
+- Navigation patterns and deep linking
+- Accessibility implementations
+- Performance optimizations
+- Security vulnerabilities
+- Code maintainability and readability
 
-    # Read full file content for better categorization
-    full_content = ''
+In FILE CHANGES, added lines are prefixed with "Line N:"; unprefixed lines are unchanged context.
+Only comment on added lines, using their line number.
+Focus on the most critical issues. Maximum {MAX_COMMENTS_PER_FILE} comments.
+Be specific and actionable in your suggestions.
+Prioritize issues by severity: Security > Performance > Bugs > Best Practices > Style"""
+
+# One file's inline comments. The schema is identical for every request, so it
+# stays in the provider's cached prompt prefix; line numbers outside the diff
+# are dropped after parsing instead of being constrained per file.
+COMMENTS_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "line": {"type": "integer"},
+            "comment": {"type": "string"}
+        },
+        "required": ["line", "comment"],
+        "additionalProperties": False
+    }
+}
+
+REVIEW_SCHEMA = {
+    "name": "review",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {"comments": COMMENTS_SCHEMA},
+        "required": ["comments"],
+        "additionalProperties": False
+    }
+}
+
+@functools.lru_cache(maxsize=None)
+def build_batch_review_schema(file_count: int) -> Dict[str, Any]:
+    """Build the structured-output schema for a batch review, one key per file."""
+    keys = [f"file_{i}" for i in range(1, file_count + 1)]
+    return {
+        "name": "batch_review",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {key: COMMENTS_SCHEMA for key in keys},
+            "required": keys,
+            "additionalProperties": False
+        }
+    }
+
+# Model calls in flight or finished during this run, keyed by hash of category + patch
+INFLIGHT_REVIEWS: Dict[str, asyncio.Future] = {}
+
+async def request_suggestions(filename: str, model: str, system_msg: str,
+                              user_msg: str) -> Optional[List[Dict[str, Any]]]:
+    """Ask the model for inline suggestions. Returns None if the model refuses."""
+    # Call OpenAI API, bounded by the shared concurrency semaphore
+    async with SEM:
+        print(f"🤖 Calling OpenAI API ({model}) for {filename}...")
+        response = await create_chat_completion(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_msg},
+                {"role": "user", "content": user_msg}
+            ],
+            temperature=0.2,
+            max_tokens=800,  # Reduced to limit response size
+            response_format={
+                "type": "json_schema",
+                "json_schema": REVIEW_SCHEMA
+            }
+        )
+
+    message = response.choices[0].message
+    if message.refusal:
+        print(f"⚠️  Model declined to review {filename}: {message.refusal}")
+        return None
+
+    return json.loads(message.content)['comments']
+
+async def request_batch_suggestions(category: str,
+                                    batch: List[tuple]) -> Optional[List[List[Dict[str, Any]]]]:
+    """Review several files of one category in a single model call.
+
+    Each batch item is (filename, file_prompt). Returns the suggestions for
+    each file in batch order, or None if the model refuses.
+    """
+    model = MODEL_FOR_CATEGORY[category]
+    file_sections = '\n\n'.join(
+        f"=== file_{i} ===\n{file_prompt}" for i, (_, file_prompt) in enumerate(batch, 1)
+    )
+    user_msg = f"""{INLINE_REVIEW_INSTRUCTIONS}
+
+Review each of the following {len(batch)} files separately. Return the comments for each file under its key (file_1, file_2, ...).
+
+{file_sections}"""
+
+    async with SEM:
+        print(f"🤖 Calling OpenAI API ({model}) for {len(batch)} files: {', '.join(item[0] for item in batch)}...")
+        response = await create_chat_completion(
+            model=model,
+            messages=[
+                {"role": "system", "content": get_system_message(category)},
+                {"role": "user", "content": user_msg}
+            ],
+            temperature=0.2,
+            max_tokens=800 * len(batch),
+            response_format={
+                "type": "json_schema",
+                "json_schema": build_batch_review_schema(len(batch))
+            }
+        )
+
+    message = response.choices[0].message
+    if message.refusal:
+        print(f"⚠️  Model declined to review batch: {message.refusal}")
+        return None
+
+    reviews = json.loads(message.content)
+    return [reviews[f"file_{i}"] for i in range(1, len(batch) + 1)]
+
+class ReviewBatcher:
+    """Groups concurrent review requests of the same category into one model call.
+
+    Files submitted within REVIEW_BATCH_WAIT of each other share a request, up to
+    REVIEW_BATCH_SIZE files, so large PRs use far fewer of the per-minute requests.
+    """
+
+    def __init__(self, batch_size: int, max_wait: float):
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.pending: Dict[str, List[tuple]] = {}
+        self.timers: Dict[str, asyncio.TimerHandle] = {}
+        self.tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, category: str, filename: str, file_prompt: str) -> Optional[List[Dict[str, Any]]]:
+        """Queue one file for review and wait for its suggestions."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self.pending.setdefault(category, [])
+        batch.append((filename, file_prompt, future))
+
+        if len(batch) >= self.batch_size:
+            self.flush(category)
+        elif len(batch) == 1:
+            self.timers[category] = loop.call_later(self.max_wait, self.flush, category)
+
+        return await future
+
+    def flush(self, category: str) -> None:
+        """Send the pending batch for a category."""
+        timer = self.timers.pop(category, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self.pending.pop(category, None)
+        if batch:
+            task = asyncio.create_task(self.run_batch(category, batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def run_batch(self, category: str, batch: List[tuple]) -> None:
+        """Request suggestions for a batch and hand each file its result."""
+        try:
+            if len(batch) == 1:
+                filename, file_prompt, _ = batch[0]
+                suggestions = await request_suggestions(
+                    filename, MODEL_FOR_CATEGORY[category], get_system_message(category),
+                    f"{INLINE_REVIEW_INSTRUCTIONS}\n\n{file_prompt}"
+                )
+                results = [suggestions]
+            else:
+                results = await request_batch_suggestions(category, [item[:2] for item in batch])
+                if results is None:
+                    results = [None] * len(batch)
+        except Exception as e:
+            for *_, future in batch:
+                future.set_exception(e)
+            return
+
+        for (*_, future), suggestions in zip(batch, results):
+            future.set_result(suggestions)
+
+REVIEW_BATCHER = ReviewBatcher(REVIEW_BATCH_SIZE, REVIEW_BATCH_WAIT)
+
+def read_file_content(filename: str, fallback: str) -> str:
+    """Read a file from the checkout, returning the fallback if it cannot be read."""
     try:
         with open(filename, 'r', encoding='utf-8') as f:
-            full_content = f.read()
-    except (FileNotFoundError, UnicodeDecodeError):
-        full_content = patch  # Fallback to patch content
+            return f.read()
+    except (OSError, UnicodeDecodeError):  # Missing, a directory (submodule), unreadable or binary
+        return fallback
+
+async def review_file_inline(file_data: Dict[str, Any],
+                             context_info: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Perform inline code review for a single file.
+
+    Returns the review comments for the file in the format expected by the
+    GitHub pull request reviews endpoint, or None if the file was skipped or
+    could not be reviewed.
+    """
+    filename = file_data['filename']
+    patch = file_data['patch']
+
+    if file_data.get('additions', 0) > MAX_REVIEW_ADDITIONS:
+        print(f"⏭️  Skipping inline review of {filename} ({file_data['additions']} additions, summary only)")
+        return None
+
+    print(f"🔍 Reviewing {filename} for inline comments...")
 
     # Categorize file and parse diff
-    category = categorize_file(filename, full_content)
-    context_info = get_file_context_info(filename, full_content)
+    category = categorize_file_from_ctx(filename, context_info)
     context_lines, valid_comment_lines = parse_diff_for_review(patch)
 
     if not context_lines:
         print(f"⚠️  No context lines found for {filename}")
-        return
+        return None
 
     print(f"📝 Found {len(valid_comment_lines)} valid lines for comments in {filename} (Category: {category})")
 
@@ -580,15 +1288,35 @@ async def review_file_inline(file_data: Dict[str, Any]) -> None:
     added_lines = [line for line in context_lines if line['type'] == 'added']
     if not added_lines:
         print(f"⚠️  No added lines to review in {filename}")
-        return
+        return None
+
+    # Reuse comments from an earlier run on the same changes, remapped to the
+    # current line numbers in case the hunks moved
+    cache_key = suggestion_cache_key(filename, patch, category)
+    cached_comments = SUGGESTIONS_CACHE.get(cache_key)
+    if cached_comments is not None:
+        print(f"♻️  Reusing cached review for {filename}")
+        remember_review(filename, cache_key, cached_comments)
+        return [
+            {
+                'path': filename,
+                'line': added_lines[comment['added_index']]['line_number'],
+                'side': 'RIGHT',
+                'body': comment['body']
+            }
+            for comment in cached_comments
+        ]
 
-    diff_context = '\n'.join([
-        f"Line {line['line_number']}: {line['content']}"
-        for line in context_lines
-    ])
+    # Skip the model call when the additions are only imports, comments or braces
+    meaningful_lines = [line for line in added_lines if not TRIVIAL_RE.match(line['content'])]
+    if len(meaningful_lines) < MIN_MEANINGFUL_LINES:
+        print(f"⏭️  Skipping {filename} (trivial changes)")
+        return []  # Reviewed: nothing worth commenting on
 
-    # Construct messages with enhanced context
-    system_msg = get_system_message(category)
+    # Keep the prompt within budget; the model may only comment on lines it sees
+    context_lines = window_diff_context(context_lines)
+    valid_comment_lines = {line['line_number'] for line in context_lines if line['type'] == 'added'}
+    diff_context = '\n'.join(format_diff_line(line) for line in context_lines)
 
     # Create context summary for better AI understanding
     context_summary = f"""
@@ -604,278 +1332,305 @@ FILE CONTEXT:
 - Has localization: {context_info['uses_localization']}
 - Complexity indicators: {context_info['complexity_indicators']}"""
 
-    # Enhanced user message with comprehensive iOS/Swift context
-    user_msg = f"""Review the changes in Swift/iOS file "{filename}" (Category: {category}).
+    # The batcher puts the static instructions first and this per-file part last,
+    # so the prompt prefix is cacheable
+    file_prompt = f"""Review the changes in Swift/iOS file "{filename}" (Category: {category}).
 {context_summary}
 
-REVIEW FOCUS AREAS:
-1. **Code Quality**: Swift best practices, naming conventions, type safety
-2. **Architecture**: MVVM patterns, dependency injection, separation of concerns
-3. **Performance**: Memory management, lazy loading, async operations
-4. **Security**: Data validation, secure storage, privacy compliance
-5. **Accessibility**: VoiceOver support, Dynamic Type, inclusive design
-6. **Modern Swift**: Latest language features, async/await, @Observable
-7. **iOS Guidelines**: Human Interface Guidelines, App Store compliance
+FILE CHANGES:
+```
+{diff_context}
+```"""
 
-PROVIDE SPECIFIC FEEDBACK ON:
-- State management patterns (@State, @Binding, @Observable)
-- Memory leaks and retain cycles (weak/unowned references)
-- Error handling and edge cases
-- Thread safety and @MainActor usage
-- Navigation patterns and deep linking
-- Accessibility implementations
-- Performance optimizations
-- Security vulnerabilities
-- Code maintainability and readability
+    # Files with identical changes in the same category share one model call
+    coalesce_key = hashlib.blake2b((category + patch).encode('utf-8'), digest_size=16).hexdigest()
+    pending = INFLIGHT_REVIEWS.get(coalesce_key)
 
-Return a JSON array with objects containing "line" (number) and "comment" (string) fields.
-Focus on the most critical issues. Maximum {MAX_COMMENTS_PER_FILE} comments.
-Be specific and actionable in your suggestions.
+    try:
+        if pending is not None:
+            print(f"♻️  {filename} has the same changes as another file - reusing its review")
+            suggestions = await asyncio.shield(pending)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            INFLIGHT_REVIEWS[coalesce_key] = future
+            suggestions = None
+            try:
+                suggestions = await REVIEW_BATCHER.submit(category, filename, file_prompt)
+            finally:
+                future.set_result(suggestions)  # None on failure, so waiters post no comments
+
+        if suggestions is None:
+            return None
+
+        # One comment per line, only on added lines the model was shown, capped per file
+        comments_by_line = {suggestion['line']: suggestion['comment'].strip() for suggestion in suggestions}
+        kept = [
+            (line_number, comment_text) for line_number, comment_text in comments_by_line.items()
+            if comment_text and line_number in valid_comment_lines
+        ][:MAX_COMMENTS_PER_FILE]
+
+        print(f"📝 Queued {len(kept)} valid comments for {filename}")
+
+        review_comments = [
+            {
+                'path': filename,
+                'line': line_number,
+                'side': 'RIGHT',
+                # Ensure proper sentence ending
+                'body': comment_text if comment_text.endswith(('.', '!', '?')) else comment_text + '.'
+            }
+            for line_number, comment_text in kept
+        ]
 
-Valid line numbers for comments: {sorted(list(valid_comment_lines))}
+        added_index = {line['line_number']: i for i, line in enumerate(added_lines)}
+        remember_review(filename, cache_key, [
+            {'added_index': added_index[comment['line']], 'body': comment['body']}
+            for comment in review_comments
+        ])
+        return review_comments
 
-FILE CHANGES:
-```
-{diff_context}
-```
+    except Exception as e:
+        print(f"❌ Error reviewing {filename}: {e}")
 
-Prioritize issues by severity: Security > Performance > Bugs > Best Practices > Style"""
+    return None
+
+async def post_review(comments: List[Dict[str, Any]]) -> bool:
+    """Post one file's inline comments as a single PR review. Returns True if successful."""
+    paths = ', '.join(f"`{path}`" for path in dict.fromkeys(comment['path'] for comment in comments))
+    comment_count = f"{len(comments)} inline comment{'' if len(comments) == 1 else 's'}"
+    print(f"📤 Posting review with {comment_count} on {paths}...")
+
+    payload = {
+        'commit_id': COMMIT_SHA,
+        'event': 'COMMENT',
+        'body': f"🤖 AI review of {paths}: {comment_count}.",
+        'comments': comments
+    }
 
     try:
-        # Call OpenAI API with rate limiting
-        print(f"🤖 Calling OpenAI API for {filename}...")
-        time.sleep(1)  # Brief delay before API call
+        response = await github_request('POST', REVIEWS_URL, json=payload)
 
-        response = client.chat.completions.create(
-            model=MODEL_INLINE,
-            messages=[
-                {"role": "system", "content": system_msg},
-                {"role": "user", "content": user_msg}
-            ],
-            temperature=0.2,
-            max_tokens=800  # Reduced to limit response size
-        )
+        if response.status_code == 200:
+            print(f"✅ Posted review with {comment_count} on {paths}")
+            return True
+        elif response.status_code == 422:
+            print(f"⚠️  Review rejected (comment outside diff?): {response.text[:200]}")
+        elif response.status_code == 403:
+            print(f"🚫 Review post forbidden or still rate limited: {response.text[:200]}")
+        else:
+            print(f"⚠️  Failed to post review - {response.status_code}")
 
-        ai_content = response.choices[0].message.content.strip()
+    except Exception as e:
+        print(f"❌ Exception posting review: {str(e)}")
 
-        # Parse JSON response
-        try:
-            # Handle potential markdown code blocks
-            if ai_content.startswith('```'):
-                ai_content = re.sub(r'^```\w*\n?', '', ai_content)
-                ai_content = re.sub(r'\n?```$', '', ai_content)
+    return False
 
-            suggestions = json.loads(ai_content)
+async def read_files(files: List[Dict[str, Any]], llm_queue: asyncio.Queue) -> int:
+    """Pipeline stage 1: read and analyze each file, then queue it for review.
 
-            if not isinstance(suggestions, list):
-                print(f"⚠️  Non-array response for {filename}")
-                return
+    Returns the number of files that could not be read.
+    """
+    failed = 0
+    for file_data in files:
+        try:
+            # Read in a worker thread so disk I/O doesn't block in-flight requests;
+            # fall back to the patch content when the file is not in the checkout
+            full_content = await asyncio.to_thread(read_file_content, file_data['filename'], file_data['patch'])
+            context_info = get_file_context_info(file_data['filename'], full_content)
+        except Exception as e:
+            print(f"❌ Error reading {file_data['filename']}: {str(e)}")
+            failed += 1
+            continue
 
-            # Filter and limit suggestions
-            valid_suggestions = []
-            for suggestion in suggestions:
-                if not all(key in suggestion for key in ['line', 'comment']):
-                    continue
+        await llm_queue.put((file_data, context_info))
 
-                line_number = suggestion['line']
+    return failed
 
-                # Validate line number is in valid comment lines
-                if line_number not in valid_comment_lines:
-                    print(f"⚠️  Skipping invalid line {line_number} for {filename}")
-                    continue
+async def llm_worker(llm_queue: asyncio.Queue, post_queue: asyncio.Queue) -> int:
+    """Pipeline stage 2: review queued files with the model, queueing their comments.
 
-                valid_suggestions.append(suggestion)
+    Returns the number of files that were skipped or could not be reviewed.
+    """
+    not_reviewed = 0
+    while True:
+        item = await llm_queue.get()
+        if item is None:
+            return not_reviewed
 
-                # Limit number of comments per file
-                if len(valid_suggestions) >= MAX_COMMENTS_PER_FILE:
-                    break
+        file_data, context_info = item
+        try:
+            comments = await review_file_inline(file_data, context_info)
+        except Exception as e:
+            print(f"❌ Error processing {file_data['filename']}: {str(e)}")
+            comments = None
 
-            print(f"📝 Posting {len(valid_suggestions)} valid comments for {filename}")
+        if comments is None:
+            not_reviewed += 1
+            continue
 
-            # Post each valid suggestion as inline comment
-            for i, suggestion in enumerate(valid_suggestions):
-                line_number = suggestion['line']
-                comment_text = suggestion['comment'].strip()
+        if comments:
+            await post_queue.put(comments)
 
-                # Ensure proper sentence ending
-                if comment_text and not comment_text.endswith(('.', '!', '?')):
-                    comment_text += '.'
+async def github_worker(post_queue: asyncio.Queue) -> tuple[int, int]:
+    """Pipeline stage 3: post each file's comments as a PR review.
 
-                # Post comment to GitHub with rate limiting
-                print(f"📤 Posting comment {i+1}/{len(valid_suggestions)} for {filename}:{line_number}")
-                await post_inline_comment(filename, line_number, comment_text)
+    Returns the number of comments posted and of reviews that failed to post.
+    """
+    posted = 0
+    failed = 0
+    while True:
+        comments = await post_queue.get()
+        if comments is None:
+            return posted, failed
 
-        except json.JSONDecodeError as e:
-            print(f"⚠️  Failed to parse JSON response for {filename}: {e}")
+        if await post_review(comments):
+            posted += len(comments)
+            confirm_posted_review(comments)
+        else:
+            failed += 1
 
-    except Exception as e:
-        print(f"❌ Error reviewing {filename}: {e}")
+async def run_inline_reviews(files: List[Dict[str, Any]]) -> tuple[int, int]:
+    """Review files through a read -> model -> post pipeline.
 
-@rate_limited_request
-async def post_inline_comment(filename: str, line_number: int, comment: str) -> None:
-    """Post an inline comment to the GitHub PR with rate limiting."""
-    payload = {
-        'body': comment,
-        'commit_id': COMMIT_SHA,
-        'path': filename,
-        'line': line_number,
-        'side': 'RIGHT'
-    }
+    Each stage has its own worker pool, so model latency for one file overlaps
+    with posting the review of another. Returns the number of comments posted
+    and the number of files without a complete inline review (skipped, failed,
+    or whose review could not be posted).
+    """
+    llm_queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_CONCURRENT_FILES)
+    post_queue: asyncio.Queue = asyncio.Queue()
 
-    url = f"https://api.github.com/repos/{OWNER}/{REPO_NAME}/pulls/{PR_NUMBER}/comments"
+    llm_workers = [asyncio.create_task(llm_worker(llm_queue, post_queue)) for _ in range(MAX_CONCURRENT_FILES)]
+    github_workers = [asyncio.create_task(github_worker(post_queue)) for _ in range(GITHUB_CONCURRENCY)]
 
     try:
-        response = requests.post(url, headers=HEADERS, json=payload)
+        unread_files = await read_files(files, llm_queue)
+    finally:
+        for _ in llm_workers:
+            await llm_queue.put(None)
+        unreviewed_counts = await asyncio.gather(*llm_workers)
+
+        for _ in github_workers:
+            await post_queue.put(None)
+        post_results = await asyncio.gather(*github_workers)
+
+        # Persist this run's posted reviews so re-runs on unchanged files skip
+        # the model call; rejected reviews are not replayed
+        save_json_cache(SUGGESTIONS_CACHE_PATH, SUGGESTIONS_USED)
+
+    comments_posted = sum(posted for posted, _ in post_results)
+    failed_posts = sum(failed for _, failed in post_results)
+    return comments_posted, unread_files + sum(unreviewed_counts) + failed_posts
+
+SUMMARY_SYSTEM_MESSAGE = "You are an expert Swift/SwiftUI architect and code reviewer with 10+ years of iOS development experience."
+
+# Sections of the architectural summary, filled in by the model as markdown
+SUMMARY_SCHEMA = {
+    "📋 Pull Request Summary": "overview and purpose of the changes; impact (High/Medium/Low); iOS version and device compatibility",
+    "🏗️ Architecture & Design Patterns": "SwiftUI/UIKit integration, MVVM and data flow, dependency injection, protocols, SOLID",
+    "🧠 Memory Management & Performance": "retain cycles, @MainActor and thread safety, async/await and Tasks, lazy loading, state management cost, networking and caching",
+    "🎨 SwiftUI & Modern iOS Development": "@Observable vs @StateObject, NavigationStack, layout containers, animations, iOS 17+ adoption",
+    "🔒 Security & Privacy Compliance": "Keychain and encryption, input validation, ATS and pinning, biometrics, privacy and tracking",
+    "♿ Accessibility & Inclusivity": "VoiceOver labels, Dynamic Type, contrast and dark mode, 44pt touch targets",
+    "🧪 Testing & Quality Assurance": "unit and UI test coverage, mocks, edge cases and error scenarios",
+    "📱 iOS Platform Compliance": "Human Interface Guidelines, App Store readiness, background tasks, notifications",
+    "⚡ Action Items & Recommendations": "numbered lists under 🔴 Critical Issues (must fix before merge), 🟡 Important Improvements, 🟢 Enhancement Opportunities",
+    "🎯 Overall Assessment": "Code Quality, iOS Compliance, Security and Accessibility scores (X/10); Merge Readiness (✅ Ready / ⚠️ Needs Minor Changes / ❌ Major Revisions Required); key strengths; areas for improvement; next steps",
+}
 
-        if response.status_code == 201:
-            print(f"✅ Posted comment on {filename}:{line_number}")
-        elif response.status_code == 422:
-            print(f"⚠️  Invalid line number {line_number} for {filename} (line not in diff)")
-        elif response.status_code == 403:
-            print(f"🚫 Rate limited - waiting longer before next request...")
-            time.sleep(10)  # Wait longer if rate limited
-        else:
-            print(f"⚠️  Failed to post comment on {filename}:{line_number} - {response.status_code}")
+# Posted instead of the analysis when the model call fails
+_FALLBACK_SUMMARY_TEMPLATE = """## 🏗️ AI Architectural Analysis
 
-    except Exception as e:
-        print(f"❌ Exception posting comment on {filename}:{line_number}: {str(e)}")
+**Note**: Error occurred during analysis generation.
+
+### Files Reviewed
+{file_list}
+
+### Status
+Analysis could not be completed due to: {status}
 
-def generate_architectural_summary(files: List[Dict[str, Any]]) -> str:
+Please review the inline comments for detailed feedback on individual files."""
+
+def format_file_list(files: List[Dict[str, Any]]) -> str:
+    """Format files as markdown bullets with their line counts."""
+    return "\n".join(
+        f"- {f['filename']} (+{f.get('additions', 0)}/-{f.get('deletions', 0)} lines)" for f in files
+    )
+
+async def summarize_file_chunk(files: List[Dict[str, Any]]) -> str:
+    """Summarize one group of changed files for the final architectural analysis."""
+    response = await create_chat_completion(
+        model=MODEL_SUMMARY,
+        messages=[
+            {"role": "system", "content": SUMMARY_SYSTEM_MESSAGE},
+            {"role": "user", "content": f"""Summarize this group of files changed in a Swift/iOS pull request in at most 5 bullet points: the modules and layers touched, the likely purpose of the changes, and any architectural, security or performance risks.
+
+{format_file_list(files)}"""}
+        ],
+        max_tokens=300,
+        temperature=0.1
+    )
+    return response.choices[0].message.content.strip()
+
+async def summarize_file_groups(files: List[Dict[str, Any]]) -> str:
+    """Summarize a large file list in parallel groups, for the final analysis to merge."""
+    chunks = [files[i:i + SUMMARY_CHUNK_SIZE] for i in range(0, len(files), SUMMARY_CHUNK_SIZE)]
+    print(f"🧩 Summarizing {len(files)} files in {len(chunks)} groups...")
+    group_summaries = await asyncio.gather(*(summarize_file_chunk(chunk) for chunk in chunks))
+    return "\n\n".join(
+        f"### Group {i} ({len(chunk)} files, e.g. {chunk[0]['filename']})\n{group_summary}"
+        for i, (chunk, group_summary) in enumerate(zip(chunks, group_summaries), 1)
+    )
+
+async def generate_architectural_summary(files: List[Dict[str, Any]]) -> str:
     """Generate high-level architectural analysis summary."""
+    # The prompt depends only on the file list, so reruns can reuse the last summary
+    cache_path = summary_cache_path(files)
+    cached_summary = load_text_cache(cache_path)
+    if cached_summary is not None:
+        print("♻️  Reusing cached architectural analysis")
+        return cached_summary
+
     print("🏗️  Generating architectural analysis...")
 
-    # Create a more detailed file analysis for the prompt
-    file_details = []
-    for file_data in files:
-        filename = file_data['filename']
-        additions = file_data.get('additions', 0)
-        deletions = file_data.get('deletions', 0)
-        file_details.append(f"- {filename} (+{additions}/-{deletions} lines)")
+    # File list for the prompt (and the fallback summary)
+    file_list = format_file_list(files)
 
-    file_list = "\n".join(file_details)
+    try:
+        if len(files) > SUMMARY_CHUNK_THRESHOLD:
+            files_section = await summarize_file_groups(files)
+        else:
+            files_section = file_list
 
-    prompt = f"""You are an expert iOS developer and architect reviewing a pull request for a Swift/iOS application.
+        prompt = f"""You are reviewing a pull request for a Swift/iOS application.
 
-**Files Changed ({len(files)} files):**
-{file_list}
+Fill this schema as markdown: one "##" heading per key (keep the emojis), with concise, actionable bullet points covering its description.
+{json.dumps(SUMMARY_SCHEMA, ensure_ascii=False)}
 
-Please provide a **comprehensive, structured analysis** covering:
-
-## 📋 Pull Request Summary
-- Brief overview of the changes and their purpose
-- Impact assessment (High/Medium/Low) on app functionality and user experience
-- Compatibility with iOS versions and device types
-
-## 🏗️ Architecture & Design Patterns
-- SwiftUI vs UIKit usage and integration patterns
-- MVVM architecture implementation and data flow
-- Dependency injection and separation of concerns
-- Protocol-oriented programming usage
-- Design pattern adherence (Repository, Factory, Observer, etc.)
-- Clean Architecture and SOLID principles compliance
-
-## 🧠 Memory Management & Performance
-- Retain cycle detection and weak/unowned reference usage
-- @MainActor usage for UI updates and thread safety
-- Async/await implementation and Task management
-- Lazy loading strategies for UI and data
-- Performance impact of state management (@Observable, @State, @Binding)
-- Memory optimization opportunities
-- Network request efficiency and caching strategies
-
-## 🎨 SwiftUI & Modern iOS Development
-- State management best practices (@Observable vs @StateObject)
-- Navigation patterns (NavigationStack, NavigationSplitView)
-- Layout system usage (Grid, LazyVStack, ViewThatFits)
-- Animation and interaction implementations
-- SF Symbols and visual effect usage
-- Modern iOS 17+ feature adoption
-
-## 🔒 Security & Privacy Compliance
-- Data encryption and Keychain usage
-- Input validation and sanitization
-- Network security (certificate pinning, ATS)
-- Biometric authentication implementation
-- Privacy compliance (data collection, tracking)
-- App Transport Security configuration
-- Secure coding practices
-
-## ♿ Accessibility & Inclusivity
-- VoiceOver support and accessibility labels
-- Dynamic Type implementation
-- High contrast and dark mode support
-- Touch target size compliance (44pt minimum)
-- Accessibility identifier usage for testing
-- Inclusive design considerations
-- Support for assistive technologies
-
-## 🧪 Testing & Quality Assurance
-- Unit test coverage and quality
-- UI test implementation for critical flows
-- Test architecture and dependency injection
-- Mock and stub usage for external dependencies
-- Performance test coverage
-- Accessibility testing implementation
-- Edge case and error scenario coverage
-
-## 📱 iOS Platform Compliance
-- Human Interface Guidelines adherence
-- App Store submission readiness
-- Platform-specific feature usage
-- Device compatibility considerations
-- iOS version support strategy
-- Background task handling
-- Push notification implementation
-
-## ⚡ Action Items & Recommendations
-### 🔴 **Critical Issues** (Must Fix Before Merge)
-1. Security vulnerabilities or data exposure risks
-2. Memory leaks or retain cycles
-3. Thread safety violations
-
-### 🟡 **Important Improvements** (Should Address Soon)
-1. Performance optimizations
-2. Accessibility enhancements
-3. Architecture improvements
-
-### 🟢 **Enhancement Opportunities** (Future Considerations)
-1. Code organization and maintainability
-2. Modern iOS feature adoption
-3. Developer experience improvements
-
-## 🎯 Overall Assessment
-- **Code Quality Score**: X/10 (based on Swift best practices)
-- **iOS Compliance Score**: X/10 (based on platform guidelines)
-- **Security Score**: X/10 (based on security best practices)
-- **Accessibility Score**: X/10 (based on inclusive design)
-- **Merge Readiness**: ✅ Ready / ⚠️ Needs Minor Changes / ❌ Major Revisions Required
-
-### Key Strengths
-- Highlight positive aspects of the implementation
-
-### Areas for Improvement
-- Specific recommendations for enhancement
-
-### Next Steps
-- Concrete action items with priority levels
-
-Format as **clear Markdown** with emojis, bullet points, and specific code examples where helpful.
-Focus on actionable feedback that will improve the iOS app's quality, security, and user experience."""
+**Files Changed ({len(files)} files):**
+{files_section}"""
 
-    try:
         print("🤖 Calling OpenAI API for architectural analysis...")
-        response = client.chat.completions.create(
+        stream = await create_chat_completion(
             model=MODEL_SUMMARY,
             messages=[
-                {"role": "system", "content": "You are an expert Swift/SwiftUI architect and code reviewer with 10+ years of iOS development experience."},
+                {"role": "system", "content": SUMMARY_SYSTEM_MESSAGE},
                 {"role": "user", "content": prompt}
             ],
             max_tokens=1500,  # Increased for more comprehensive analysis
-            temperature=0.1   # Lower temperature for more consistent analysis
+            temperature=0.1,  # Lower temperature for more consistent analysis
+            stream=True
         )
 
-        summary_content = response.choices[0].message.content.strip()
+        # Consume tokens as they are generated rather than waiting for the full completion
+        parts = []
+        async for chunk in stream:
+            if chunk.choices:
+                parts.append(chunk.choices[0].delta.content or "")
+
+        summary_content = "".join(parts).strip()
         print("✅ Successfully generated architectural analysis")
+        save_text_cache(cache_path, summary_content)
         return summary_content
 
     except Exception as e:
@@ -883,20 +1638,22 @@ Focus on actionable feedback that will improve the iOS app's quality, security,
         print(error_msg)
 
         # Return a basic fallback summary
-        return f"""## 🏗️ AI Architectural Analysis
+        return _FALLBACK_SUMMARY_TEMPLATE.format(file_list=file_list, status=str(e))
 
-**Note**: Error occurred during analysis generation.
-
-### Files Reviewed
-{file_list}
+async def summarize_small_pr(files: List[Dict[str, Any]], review_task: asyncio.Task) -> str:
+    """Summarize a small PR, skipping the model call if every file was reviewed without comments."""
+    try:
+        comments_posted, files_not_reviewed = await review_task
+    except Exception:
+        comments_posted = files_not_reviewed = None  # Reported by run_review; still generate the summary
 
-### Status
-Analysis could not be completed due to: {str(e)}
+    if comments_posted == 0 and files_not_reviewed == 0:
+        print("ℹ️  No inline comments on a small PR - skipping architectural analysis")
+        return f"## 🏗️ AI Code Review Summary\n\n✅ The AI review left no inline comments on {len(files)} file(s)."
 
-Please review the inline comments for detailed feedback on individual files."""
+    return await generate_architectural_summary(files)
 
-@rate_limited_request
-def post_summary_comment(content: str) -> bool:
+async def post_summary_comment(content: str) -> bool:
     """Post the architectural summary as a PR comment. Returns True if successful."""
     print("📝 Posting architectural summary to PR...")
 
@@ -910,29 +1667,16 @@ def post_summary_comment(content: str) -> bool:
 >
 > 🔍 **Inline Comments**: Check individual file diffs for detailed line-by-line feedback.
 >
-> 📅 **Generated**: {os.getenv('GITHUB_SHA', 'Unknown commit')[:7]}"""
+> 📅 **Generated**: {SHORT_SHA}"""
 
-    url = f"https://api.github.com/repos/{OWNER}/{REPO_NAME}/issues/{PR_NUMBER}/comments"
     payload = {"body": full_comment}
 
     try:
-        response = requests.post(url, headers=HEADERS, json=payload)
+        response = await github_request('POST', COMMENTS_URL, json=payload)
 
         if response.status_code == 201:
             print("✅ Successfully posted architectural analysis summary to PR")
             return True
-        elif response.status_code == 403:
-            print("🚫 Rate limited when posting summary - waiting and retrying...")
-            time.sleep(15)  # Wait longer for summary
-
-            # Retry once
-            response = requests.post(url, headers=HEADERS, json=payload)
-            if response.status_code == 201:
-                print("✅ Successfully posted summary after retry")
-                return True
-            else:
-                print(f"❌ Failed summary retry: {response.status_code}")
-                return False
         else:
             print(f"❌ Failed to post summary comment: {response.status_code} - {response.text[:200]}")
             return False
@@ -943,11 +1687,20 @@ def post_summary_comment(content: str) -> bool:
 
 async def main():
     """Main execution function."""
+    try:
+        await run_review()
+    finally:
+        await HTTP.aclose()
+
+async def run_review():
+    """Fetch, review, and summarize the pull request."""
     print("🚀 Starting comprehensive AI code review...")
-    print(f"⚙️  Rate limiting: {API_DELAY}s between requests, max {MAX_COMMENTS_PER_FILE} comments per file")
+    print(f"⚙️  Max {MAX_COMMENTS_PER_FILE} comments per file, posted as one PR review per file")
+    print(f"⚙️  Concurrency: {MAX_CONCURRENT_FILES} file workers, {REVIEW_CONCURRENCY} OpenAI requests, "
+          f"{GITHUB_CONCURRENCY} GitHub workers")
 
     # Fetch PR files
-    files = fetch_pr_files()
+    files = await fetch_pr_files()
     if not files:
         print("ℹ️  No files found in PR")
         return
@@ -970,57 +1723,28 @@ The PR may contain only:
 - Documentation files
 
 No code review comments were generated."""
-        post_summary_comment(summary)
+        await post_summary_comment(summary)
         return
 
     print(f"📁 Files selected for review: {[f['filename'] for f in files_to_review]}")
 
-    # 1. Perform inline reviews for each file
-    print("\n🔍 Starting inline code reviews...")
+    # 1. Inline reviews and 2. architectural summary run concurrently; the
+    # summary only needs the file list, not the review results
+    print(f"\n🔍 Starting inline code reviews and architectural summary for {len(files_to_review)} files...")
     total_comments_posted = 0
-
-    for i, file_data in enumerate(files_to_review, 1):
-        print(f"\n📄 Processing file {i}/{len(files_to_review)}: {file_data['filename']}")
-        try:
-            await review_file_inline(file_data)
-
-            # Add delay between files to avoid overwhelming GitHub API
-            if i < len(files_to_review):  # Don't delay after last file
-                print(f"⏸️  Waiting {API_DELAY}s before next file...")
-                time.sleep(API_DELAY)
-
-        except Exception as e:
-            print(f"❌ Error processing {file_data['filename']}: {str(e)}")
-            continue
-
-    # 2. Generate and post architectural summary (always attempt this)
-    print(f"\n🏗️  Generating architectural summary for {len(files_to_review)} files...")
+    review_task = asyncio.create_task(run_inline_reviews(files_to_review))
+    if len(files_to_review) <= SMALL_PR_MAX_FILES:
+        summary_task = asyncio.create_task(summarize_small_pr(files_to_review, review_task))
+    else:
+        summary_task = asyncio.create_task(generate_architectural_summary(files_to_review))
+
+    # Post architectural summary as soon as it is ready, while inline reviews
+    # may still be running (always attempt this)
     try:
-        print("⏸️  Waiting before summary generation...")
-        time.sleep(3)  # Extra wait before summary
-
-        summary = generate_architectural_summary(files_to_review)
-        success = post_summary_comment(summary)
-
-        if not success:
-            print("⚠️  Retrying summary post with simplified content...")
-            # Fallback: post a simple summary
-            simple_summary = f"""## 🏗️ AI Code Review Summary
-
-**Files Reviewed**: {len(files_to_review)} files
-- {chr(10).join([f"• {f['filename']}" for f in files_to_review])}
-
-**Status**: Analysis completed with rate limiting. Check inline comments for specific feedback.
-
-*Note: Simplified summary due to API limitations.*"""
-
-            time.sleep(5)  # Wait before retry
-            post_summary_comment(simple_summary)
-
+        summary = await summary_task
     except Exception as e:
         print(f"❌ Critical error in summary generation: {str(e)}")
-        # Always try to post something
-        error_summary = f"""## 🏗️ AI Code Review Summary
+        summary = f"""## 🏗️ AI Code Review Summary
 
 **Error**: Summary generation failed: {str(e)}
 
@@ -1028,12 +1752,19 @@ No code review comments were generated."""
 
 Please check individual file comments for detailed feedback."""
 
-        time.sleep(3)
-        post_summary_comment(error_summary)
+    # Post in the background: retries with backoff (in github_request) overlap
+    # the remaining inline reviews instead of running after them
+    summary_post_task = asyncio.create_task(post_summary_comment(summary))
+
+    try:
+        total_comments_posted, _ = await review_task
+    except Exception as e:
+        print(f"❌ Inline review failed: {e}")
+
+    await asyncio.gather(summary_post_task, return_exceptions=True)
 
     print(f"\n✅ Code review process complete!")
-    print(f"📈 Processed {len(files_to_review)} files with rate limiting")
+    print(f"📈 Processed {len(files_to_review)} files, posted {total_comments_posted} inline comments")
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
\ No newline at end of file